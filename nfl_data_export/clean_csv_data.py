@@ -1,357 +1,369 @@
+import gzip
+import json
+import os
+import shutil
+import threading
 import polars as pl
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
+from typing import Callable
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class TableFix:
+    """A data fix applied to a table only when `needed` (a boolean aggregate) is true"""
+    needed: pl.Expr
+    apply: Callable[[pl.LazyFrame], pl.LazyFrame]
+    description: str
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Declarative description of one CSV table and how to clean it"""
+    file_name: str
+    pk: tuple[str, ...]
+    schema: pl.Schema
+    fix: TableFix | None = None
+
+    @property
+    def name(self) -> str:
+        return Path(self.file_name).stem
+
+    @cached_property
+    def pk_filter(self) -> pl.Expr:
+        """
+        Rows with every PK column present; built once and reused (pl.Expr is immutable).
+        all_horizontal reduces the validity masks in one fused pass instead of a
+        left-deep chain of binary ANDs.
+        """
+        return pl.all_horizontal([pl.col(c).is_not_null() for c in self.pk])
+
+
+def _atomic_write(file_path: Path, write: Callable[[Path], None]):
+    """
+    Run write() against a sibling temp file, then os.replace it over file_path.
+    A crash mid-write leaves the original file intact, and the temp file is
+    removed if the write fails.
+    """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+# Year 0000 is not valid in PostgreSQL. Compare the fixed 4-byte year prefix
+# rather than starts_with, one identical mask per date column.
+CONTRACT_DATE_COLS = ("contractCreateDate", "contractExpireDate")
+_INVALID_DATE = {c: pl.col(c).str.slice(0, 4) == "0000" for c in CONTRACT_DATE_COLS}
+
+
+def _fix_contract_dates(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Null out invalid 0000-xx-xx contract dates in a single with_columns"""
+    return lf.with_columns([
+        pl.when(_INVALID_DATE[c]).then(None).otherwise(pl.col(c)).alias(c)
+        for c in CONTRACT_DATE_COLS
+    ])
+
+
+# Manifest of (mtime, size, outputs) per table as of its last successful clean
+CACHE_FILE = ".clean_cache.json"
+
+NULL_VALUES = ["", "NA", "NaN", "null", "NULL"]
+
+# Schema overrides per table, built once at import and reused by every scan.
+# Low-cardinality text columns are Categorical so they are stored and hashed as
+# small dictionary codes; CSV output still writes the strings.
+PLAYER_MAPPING_SCHEMA = pl.Schema({
+    "playerID": pl.Utf8,
+    "playerID_trade": pl.Utf8,
+    "full_name": pl.Utf8,
+    "first_name": pl.Utf8,
+    "last_name": pl.Utf8,
+})
+
+TEAM_MAPPING_SCHEMA = pl.Schema({
+    "teamID": pl.UInt64,  # can exceed i64 range
+    "name": pl.Utf8,
+    "city": pl.Utf8,
+    "conference": pl.Categorical(),
+    "division": pl.Categorical(),
+})
+
+WEEKLY_PLAYER_SCHEMA = pl.Schema({
+    "playerID": pl.Utf8,
+    "week": pl.Int32,
+    "year": pl.Int32,
+    "teamID": pl.UInt64,  # can exceed i64 range
+    "position": pl.Categorical(),
+    "ppg": pl.Float64,
+    "yards": pl.Int32,  # season totals are far below i32 range
+})
+
+HISTORIC_PLAYER_SCHEMA = pl.Schema({
+    "playerID": pl.Utf8,
+    "year": pl.Int32,
+    "teamID": pl.UInt64,  # can exceed i64 range
+    "position": pl.Categorical(),
+    "ppg": pl.Float64,
+    "yards": pl.Int32,  # season totals are far below i32 range
+})
+
+WEEKLY_TEAM_SCHEMA = pl.Schema({
+    "teamID": pl.UInt64,  # can exceed i64 range
+    "week": pl.Int32,
+    "year": pl.Int32,
+    "wins": pl.Int16,  # per-season counts and scores fit in i16
+    "losses": pl.Int16,
+    "ties": pl.Int16,
+    "pointsFor": pl.Int16,
+    "pointsAgainst": pl.Int16,
+})
+
+PLAYER_CONTRACTS_SCHEMA = pl.Schema({
+    "playerID": pl.Utf8,
+    "year": pl.Int32,
+    "contractSalary": pl.Float64,
+    "contractCreateDate": pl.Utf8,
+    "contractExpireDate": pl.Utf8,
+    "year_signed": pl.Int32,
+    "contract_years": pl.Int32,
+})
+
+INJURY_SCHEMA = pl.Schema({
+    "playerID": pl.Utf8,
+    "week": pl.Int32,
+    "year": pl.Int32,
+    "injuryStatus": pl.Categorical(),
+    "primaryInjury": pl.Categorical(),
+    "practiceStatus": pl.Categorical(),
+})
+
+SNAP_COUNTS_SCHEMA = pl.Schema({
+    "playerID": pl.Utf8,
+    "week": pl.Int32,
+    "year": pl.Int32,
+    "offenseSnaps": pl.Float64,
+    "offensePct": pl.Float64,
+    "defenseSnaps": pl.Float64,
+    "defensePct": pl.Float64,
+})
+
+TRADE_SCHEMA = pl.Schema({
+    "trade_id": pl.Float64,
+    "season": pl.Int32,
+    "date": pl.Utf8,
+    "team_gave": pl.UInt64,  # hashed team ID
+    "team_received": pl.UInt64,  # hashed team ID
+    "playerID": pl.Utf8,
+})
+
+TABLES = (
+    TableSpec("PlayerMapping.csv", pk=("playerID",), schema=PLAYER_MAPPING_SCHEMA),
+    TableSpec("TeamMapping.csv", pk=("teamID",), schema=TEAM_MAPPING_SCHEMA),
+    # 3NF: injuryStatus and playTime moved to separate tables
+    TableSpec("WeeklyPlayerData.csv", pk=("playerID", "week", "year"), schema=WEEKLY_PLAYER_SCHEMA),
+    # PK includes teamID to preserve data for players who played on multiple teams in a year
+    TableSpec("HistoricPlayerData.csv", pk=("playerID", "year", "teamID"), schema=HISTORIC_PLAYER_SCHEMA),
+    TableSpec("WeeklyTeamData.csv", pk=("teamID", "week", "year"), schema=WEEKLY_TEAM_SCHEMA),
+    TableSpec("PlayerContracts.csv", pk=("playerID", "year", "year_signed"), schema=PLAYER_CONTRACTS_SCHEMA, fix=TableFix(
+        needed=pl.any_horizontal(list(_INVALID_DATE.values())).any(),
+        apply=_fix_contract_dates,
+        description="fixed invalid 0000-xx-xx dates",
+    )),
+    TableSpec("InjuryData.csv", pk=("playerID", "week", "year"), schema=INJURY_SCHEMA),
+    TableSpec("SnapCounts.csv", pk=("playerID", "week", "year"), schema=SNAP_COUNTS_SCHEMA),
+    # 3NF: player_name removed - join with PlayerMapping
+    TableSpec("TradeTable.csv", pk=("trade_id", "playerID"), schema=TRADE_SCHEMA),
+)
+
+
 class CSVCleaner:
-    def __init__(self, data_dir="output"):
+    def __init__(self, data_dir="output", write_parquet=False, compress_csv=False, use_cache=True):
         self.data_dir = Path(data_dir)
+        # Also keep a zstd Parquet copy of each cleaned table; CSV stays the import format
+        self.write_parquet = write_parquet
+        # Also keep a gzip copy (<name>.csv.gz) of each cleaned CSV for shipping/COPY FROM PROGRAM
+        self.compress_csv = compress_csv
+        # Skip files that haven't changed since they were last cleaned
+        self.use_cache = use_cache
+        self._cache_path = self.data_dir / CACHE_FILE
+        self._cache = self._load_cache() if use_cache else {}
+        self._cache_lock = threading.Lock()
     
-    def _read_csv(self, file_path: Path, schema_overrides: dict | None = None) -> pl.DataFrame:
+    def _load_cache(self) -> dict:
+        try:
+            return json.loads(self._cache_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _cache_entry(self, file_path: Path) -> list:
+        """Identity of a cleaned file: its stat plus which optional outputs were produced"""
+        st = file_path.stat()
+        return [st.st_mtime_ns, st.st_size, self.write_parquet, self.compress_csv]
+    
+    def _save_cache(self):
+        _atomic_write(self._cache_path, lambda tmp_path: tmp_path.write_text(json.dumps(self._cache, indent=2)))
+    
+    def _scan_csv(self, file_path: Path, schema_overrides: dict | None = None) -> pl.LazyFrame:
         """
-        Read CSV with safe defaults:
+        Lazily scan CSV with safe defaults:
         - Handle very large numeric IDs (e.g., teamID > i64) via schema_overrides
         - Treat empty strings as nulls
         - Tolerate ragged lines with trailing commas
+        - Memory-map the file (scan_csv's default for local paths) via its absolute
+          path, and keep low_memory off so the parser reads large chunks
         """
-        return pl.read_csv(
-            file_path,
+        return pl.scan_csv(
+            file_path.resolve(),
+            low_memory=False,
             infer_schema_length=10000,
-            null_values=["", "NA", "NaN", "null", "NULL"],
+            null_values=NULL_VALUES,
             schema_overrides=schema_overrides or {},
             truncate_ragged_lines=True,
         )
-        
-    def clean_player_mapping(self):
-        """Clean PlayerMapping.csv - remove rows without playerID"""
-        file_path = self.data_dir / "PlayerMapping.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
-            return
-        
-        df = self._read_csv(file_path, schema_overrides={
-            "playerID": pl.Utf8,
-            "playerID_trade": pl.Utf8,
-            "full_name": pl.Utf8,
-            "first_name": pl.Utf8,
-            "last_name": pl.Utf8,
-        })
-        original_count = len(df)
-        
-        df_clean = df.filter(pl.col("playerID").is_not_null() & (pl.col("playerID") != ""))
-        
-        # Deduplicate by primary key (playerID)
-        df_clean = df_clean.unique(subset=["playerID"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"PlayerMapping: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"PlayerMapping: no issues found ({original_count} rows)")
-    
-    def clean_team_mapping(self):
-        """Clean TeamMapping.csv - remove rows without teamID"""
-        file_path = self.data_dir / "TeamMapping.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
-            return
-        
-        df = self._read_csv(file_path, schema_overrides={
-            "teamID": pl.UInt64,  # can exceed i64 range
-            "name": pl.Utf8,
-            "city": pl.Utf8,
-            "conference": pl.Utf8,
-            "division": pl.Utf8,
-        })
-        original_count = len(df)
-        
-        df_clean = df.filter(pl.col("teamID").is_not_null())
-        
-        # Deduplicate by primary key (teamID)
-        df_clean = df_clean.unique(subset=["teamID"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"TeamMapping: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"TeamMapping: no issues found ({original_count} rows)")
-    
-    def clean_weekly_player_data(self):
-        """Clean WeeklyPlayerData.csv - remove rows without playerID, week, or year and deduplicate"""
-        file_path = self.data_dir / "WeeklyPlayerData.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
+
+    def _sibling_is_fresh(self, file_path: Path, suffix: str) -> bool:
+        """True when file_path's sibling with the given suffix is at least as new as the CSV"""
+        sibling = file_path.with_suffix(suffix)
+        return sibling.exists() and sibling.stat().st_mtime_ns >= file_path.stat().st_mtime_ns
+
+    def _parquet_is_fresh(self, file_path: Path) -> bool:
+        return self._sibling_is_fresh(file_path, ".parquet")
+
+    def _scan(self, file_path: Path, schema_overrides: dict | None = None) -> pl.LazyFrame:
+        """
+        Scan a table, preferring an up-to-date Parquet sibling over the CSV.
+        Parquet carries its own schema, so no parsing or type inference is needed.
+        """
+        if self._parquet_is_fresh(file_path):
+            return pl.scan_parquet(file_path.with_suffix(".parquet"))
+        return self._scan_csv(file_path, schema_overrides)
+
+    def _sink_csv(self, lf: pl.LazyFrame, file_path: Path):
+        """
+        Stream a cleaned LazyFrame back over its source file.
+        The source is still being scanned while the sink runs, so the write
+        has to go through a temp file that is swapped into place afterwards.
+        """
+        _atomic_write(file_path, lf.sink_csv)
+
+    def _write_parquet_output(self, lf: pl.LazyFrame, file_path: Path, rewrite_csv: bool):
+        """
+        Write the cleaned table as zstd Parquet next to the CSV.
+        When the CSV also changed it is re-emitted from the Parquet file, so the
+        cleaning plan only runs once; the Parquet file is swapped in last so it
+        stays at least as new as the CSV.
+        """
+        if not rewrite_csv and self._parquet_is_fresh(file_path):
             return
         
-        # 3NF: injuryStatus and playTime moved to separate tables
-        df = self._read_csv(file_path, schema_overrides={
-            "playerID": pl.Utf8,
-            "week": pl.Int32,
-            "year": pl.Int32,
-            "teamID": pl.UInt64,  # can exceed i64 range
-            "position": pl.Utf8,
-            "ppg": pl.Float64,
-            "yards": pl.Int64,
-        })
-        original_count = len(df)
-        
-        # Filter out rows with missing keys
-        df_clean = df.filter(
-            pl.col("playerID").is_not_null() & 
-            (pl.col("playerID") != "") &
-            pl.col("week").is_not_null() &
-            pl.col("year").is_not_null()
-        )
+        def write(tmp_path: Path):
+            lf.sink_parquet(tmp_path, compression="zstd", statistics=True)
+            if rewrite_csv:
+                self._sink_csv(pl.scan_parquet(tmp_path), file_path)
+                os.utime(tmp_path)  # keep the Parquet file newer than the CSV it was written before
         
-        # Deduplicate by primary key (playerID, week, year) - keep first occurrence
-        df_clean = df_clean.unique(subset=["playerID", "week", "year"], keep="first")
-        cleaned_count = len(df_clean)
+        _atomic_write(file_path.with_suffix(".parquet"), write)
+
+    def _write_gzip_output(self, file_path: Path):
+        """
+        Gzip the final CSV bytes to <name>.csv.gz. Compressing the file that was
+        just written avoids re-running the plan or re-serializing the rows.
+        """
+        def write(tmp_path: Path):
+            with open(file_path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=3) as dst:
+                shutil.copyfileobj(src, dst, length=1 << 20)
         
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"WeeklyPlayerData: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"WeeklyPlayerData: no issues found ({original_count} rows)")
-    
-    def clean_historic_player_data(self):
-        """Clean HistoricPlayerData.csv - remove rows without playerID or year and deduplicate"""
-        file_path = self.data_dir / "HistoricPlayerData.csv"
+        _atomic_write(file_path.with_suffix(".csv.gz"), write)
+
+    def _write_outputs(self, lf: pl.LazyFrame, file_path: Path, rewrite_csv: bool = True):
+        """Write a cleaned table to its CSV (if changed) and optional Parquet/gzip siblings"""
+        if self.write_parquet:
+            self._write_parquet_output(lf, file_path, rewrite_csv)
+        elif rewrite_csv:
+            self._sink_csv(lf, file_path)
+        
+        if self.compress_csv and (rewrite_csv or not self._sibling_is_fresh(file_path, ".csv.gz")):
+            self._write_gzip_output(file_path)
+
+    def _clean_table(self, spec: TableSpec):
+        """Clean one table unless it is missing or unchanged since its last clean"""
+        file_path = self.data_dir / spec.file_name
         if not file_path.exists():
             logger.warning(f"{file_path} not found, skipping")
             return
         
-        # 3NF: injuryStatus and playTime moved to separate tables
-        df = self._read_csv(file_path, schema_overrides={
-            "playerID": pl.Utf8,
-            "year": pl.Int32,
-            "teamID": pl.UInt64,  # can exceed i64 range
-            "position": pl.Utf8,
-            "ppg": pl.Float64,
-            "yards": pl.Int64,
-        })
-        original_count = len(df)
-        
-        # Filter out rows with missing keys (all PK columns required)
-        df_clean = df.filter(
-            pl.col("playerID").is_not_null() & 
-            (pl.col("playerID") != "") &
-            pl.col("year").is_not_null() &
-            pl.col("teamID").is_not_null()
-        )
-        
-        # Deduplicate by primary key (playerID, year, teamID) - keep first occurrence
-        # This preserves data for players who played on multiple teams in a year
-        df_clean = df_clean.unique(subset=["playerID", "year", "teamID"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"HistoricPlayerData: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"HistoricPlayerData: no issues found ({original_count} rows)")
-    
-    def clean_weekly_team_data(self):
-        """Clean WeeklyTeamData.csv - remove rows without teamID, week, or year"""
-        file_path = self.data_dir / "WeeklyTeamData.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
+        if self.use_cache and self._cache.get(spec.name) == self._cache_entry(file_path):
+            logger.info(f"{spec.name}: unchanged since last clean, skipping")
             return
         
-        df = self._read_csv(file_path, schema_overrides={
-            "teamID": pl.UInt64,  # can exceed i64 range
-            "week": pl.Int32,
-            "year": pl.Int32,
-            "wins": pl.Int32,
-            "losses": pl.Int32,
-            "ties": pl.Int32,
-            "pointsFor": pl.Int32,
-            "pointsAgainst": pl.Int32,
-        })
-        original_count = len(df)
+        self._clean_file(spec, file_path)
         
-        df_clean = df.filter(
-            pl.col("teamID").is_not_null() &
-            pl.col("week").is_not_null() &
-            pl.col("year").is_not_null()
-        )
-        
-        # Deduplicate by primary key (teamID, week, year)
-        df_clean = df_clean.unique(subset=["teamID", "week", "year"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"WeeklyTeamData: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"WeeklyTeamData: no issues found ({original_count} rows)")
+        with self._cache_lock:
+            self._cache[spec.name] = self._cache_entry(file_path)
     
-    def clean_player_contracts(self):
-        """Clean PlayerContracts.csv - remove rows without playerID or year"""
-        file_path = self.data_dir / "PlayerContracts.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
-            return
-        
-        df = self._read_csv(file_path, schema_overrides={
-            "playerID": pl.Utf8,
-            "year": pl.Int32,
-            "contractSalary": pl.Float64,
-            "contractCreateDate": pl.Utf8,
-            "contractExpireDate": pl.Utf8,
-            "year_signed": pl.Int32,
-            "contract_years": pl.Int32,
-        })
-        original_count = len(df)
-        
-        df_clean = df.filter(
-            pl.col("playerID").is_not_null() & 
-            (pl.col("playerID") != "") &
-            pl.col("year").is_not_null() &
-            pl.col("year_signed").is_not_null()
+    def _clean_file(self, spec: TableSpec, file_path: Path):
+        """Drop rows with a missing primary key, deduplicate by it, apply any fix"""
+        lf = self._scan(file_path, schema_overrides=spec.schema)
+        
+        # Deduplicate by primary key - keep first occurrence. group_by().first() has a
+        # streaming implementation; row order on disk doesn't matter, only column order
+        columns = lf.collect_schema().names()
+        lf_clean = (
+            lf.filter(spec.pk_filter)  # empty strings already parse as null
+              .group_by(spec.pk, maintain_order=False)
+              .agg(pl.exclude(spec.pk).first())
+              .select(columns)
         )
         
-        # Fix invalid dates (year 0000 is not valid in PostgreSQL)
-        df_clean = df_clean.with_columns([
-            pl.when(pl.col("contractCreateDate").str.starts_with("0000"))
-              .then(None)
-              .otherwise(pl.col("contractCreateDate"))
-              .alias("contractCreateDate"),
-            pl.when(pl.col("contractExpireDate").str.starts_with("0000"))
-              .then(None)
-              .otherwise(pl.col("contractExpireDate"))
-              .alias("contractExpireDate"),
+        # Hand both count probes to Polars in one collect_all call: a single trip into
+        # the native engine, which runs them in parallel and shares the scan between them
+        # The raw scan yields both the original and the non-null-PK counts in one aggregate
+        checks = [pl.len()] if spec.fix is None else [pl.len(), spec.fix.needed]
+        original, cleaned = pl.collect_all([
+            lf.select([pl.len().alias("original"), spec.pk_filter.sum().alias("valid")]),
+            lf_clean.select(checks),
         ])
-        
-        # Deduplicate by primary key (playerID, year, year_signed)
-        df_clean = df_clean.unique(subset=["playerID", "year", "year_signed"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        # Always write to fix invalid dates
-        df_clean.write_csv(file_path)
-        logger.info(f"PlayerContracts: {cleaned_count} rows (removed {original_count - cleaned_count} duplicates, fixed invalid 0000-xx-xx dates)")
-
-    def clean_injury_data(self):
-        """Clean InjuryData.csv - remove rows without playerID, week, or year"""
-        file_path = self.data_dir / "InjuryData.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
-            return
-        
-        df = self._read_csv(file_path, schema_overrides={
-            "playerID": pl.Utf8,
-            "week": pl.Int32,
-            "year": pl.Int32,
-            "injuryStatus": pl.Utf8,
-            "primaryInjury": pl.Utf8,
-            "practiceStatus": pl.Utf8,
-        })
-        original_count = len(df)
-        
-        df_clean = df.filter(
-            pl.col("playerID").is_not_null() & 
-            (pl.col("playerID") != "") &
-            pl.col("week").is_not_null() &
-            pl.col("year").is_not_null()
-        )
-        
-        # Deduplicate by primary key (playerID, week, year)
-        df_clean = df_clean.unique(subset=["playerID", "week", "year"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"InjuryData: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"InjuryData: no issues found ({original_count} rows)")
-
-    def clean_snap_counts(self):
-        """Clean SnapCounts.csv - remove rows without playerID, week, or year"""
-        file_path = self.data_dir / "SnapCounts.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
+        original_count, valid_count = original.row(0)
+        cleaned_count, *fix_needed = cleaned.row(0)
+        needs_fix = any(fix_needed)
+        removed = original_count - cleaned_count
+        
+        if not removed and not needs_fix:
+            self._write_outputs(lf_clean, file_path, rewrite_csv=False)
+            logger.info(f"{spec.name}: no issues found ({original_count} rows)")
             return
         
-        df = self._read_csv(file_path, schema_overrides={
-            "playerID": pl.Utf8,
-            "week": pl.Int32,
-            "year": pl.Int32,
-            "offenseSnaps": pl.Float64,
-            "offensePct": pl.Float64,
-            "defenseSnaps": pl.Float64,
-            "defensePct": pl.Float64,
-        })
-        original_count = len(df)
+        if needs_fix:
+            lf_clean = spec.fix.apply(lf_clean)
         
-        df_clean = df.filter(
-            pl.col("playerID").is_not_null() & 
-            (pl.col("playerID") != "") &
-            pl.col("week").is_not_null() &
-            pl.col("year").is_not_null()
+        self._write_outputs(lf_clean, file_path)
+        fix_note = f", {spec.fix.description}" if needs_fix else ""
+        logger.info(
+            f"{spec.name}: removed {removed} rows "
+            f"({original_count - valid_count} nulls + {valid_count - cleaned_count} duplicates){fix_note}"
         )
-        
-        # Deduplicate by primary key (playerID, week, year)
-        df_clean = df_clean.unique(subset=["playerID", "week", "year"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"SnapCounts: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"SnapCounts: no issues found ({original_count} rows)")
-
-    def clean_trade_data(self):
-        """Clean TradeTable.csv - remove rows without trade_id or playerID"""
-        file_path = self.data_dir / "TradeTable.csv"
-        if not file_path.exists():
-            logger.warning(f"{file_path} not found, skipping")
-            return
-        
-        # 3NF: player_name removed - join with PlayerMapping
-        df = self._read_csv(file_path, schema_overrides={
-            "trade_id": pl.Float64,
-            "season": pl.Int32,
-            "date": pl.Utf8,
-            "team_gave": pl.UInt64,  # hashed team ID
-            "team_received": pl.UInt64,  # hashed team ID
-            "playerID": pl.Utf8,
-        })
-        original_count = len(df)
-        
-        df_clean = df.filter(
-            pl.col("trade_id").is_not_null() &
-            pl.col("playerID").is_not_null() & 
-            (pl.col("playerID") != "")
-        )
-        
-        # Deduplicate by primary key (trade_id, playerID)
-        df_clean = df_clean.unique(subset=["trade_id", "playerID"], keep="first")
-        cleaned_count = len(df_clean)
-        
-        if original_count != cleaned_count:
-            df_clean.write_csv(file_path)
-            logger.info(f"TradeTable: removed {original_count - cleaned_count} rows (nulls + duplicates)")
-        else:
-            logger.info(f"TradeTable: no issues found ({original_count} rows)")
     
     def clean_all(self):
         """Clean all CSV files"""
         logger.info(f"Starting CSV cleaning process for {self.data_dir}/")
         logger.info("=" * 60)
         
-        self.clean_player_mapping()
-        self.clean_team_mapping()
-        self.clean_weekly_player_data()
-        self.clean_historic_player_data()
-        self.clean_weekly_team_data()
-        self.clean_player_contracts()
-        self.clean_injury_data()
-        self.clean_snap_counts()
-        self.clean_trade_data()
+        # Each file is independent and Polars releases the GIL while scanning/writing,
+        # so run them concurrently; list() re-raises the first failure
+        with ThreadPoolExecutor(max_workers=min(len(TABLES), os.cpu_count() or 1)) as executor:
+            list(executor.map(self._clean_table, TABLES))
+        
+        if self.use_cache and self._cache:
+            self._save_cache()
         
         logger.info("=" * 60)
         logger.info("✓ CSV cleaning complete!")
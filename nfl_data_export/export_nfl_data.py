@@ -1,5 +1,9 @@
+import hashlib
+import os
 import polars as pl
 import nflreadpy as nfl
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 import logging
 
@@ -7,6 +11,13 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+def _is_empty(df: pl.DataFrame | pl.LazyFrame) -> bool:
+    """Emptiness check that materializes at most one row when given a LazyFrame"""
+    if isinstance(df, pl.LazyFrame):
+        return df.limit(1).collect().is_empty()
+    return df.is_empty()
+
+
 class NFLDataExporter:
     # Team relocation mapping: maps historical locations to current canonical names
     TEAM_RELOCATIONS = {
@@ -23,69 +34,143 @@ class NFLDataExporter:
         "Oakland Raiders": "Las Vegas Raiders",
     }
 
-    def __init__(self, start_year=2020, end_year=2025, output_dir="output"):
+    # Per-player weekly stat columns and their narrowest safe dtypes. Weekly counts stay
+    # well inside Int16; the group_by sums in HistoricPlayerData widen back to Int64.
+    STAT_COUNT_COLS = [
+        "yards",
+        "completions", "attempts", "passing_yards", "passing_tds", "passing_interceptions",
+        "sacks_suffered", "sack_yards_lost",
+        "carries", "rushing_yards", "rushing_tds", "rushing_fumbles", "rushing_fumbles_lost",
+        "receptions", "targets", "receiving_yards", "receiving_tds", "receiving_fumbles", "receiving_fumbles_lost",
+        "def_tackles_solo", "def_tackles_with_assist", "def_tackle_assists", "def_tackles_for_loss",
+        "def_sack_yards", "def_qb_hits", "def_interceptions", "def_interception_yards",
+        "def_pass_defended", "def_fumbles_forced", "def_fumbles", "def_tds",
+        "fg_made", "fg_att", "pat_made", "pat_att",
+        "kickoff_returns", "kickoff_return_yards", "punt_returns", "punt_return_yards",
+    ]
+    STAT_FLOAT_COLS = ["ppg", "ppg_ppr", "def_sacks", "fg_pct"]
+
+    # Source columns each fetched dataset is trimmed to right after loading. nflreadpy
+    # reads whole files (player_stats alone has well over 100 columns), so projecting
+    # here keeps the unused ones out of memory, the fetch cache and every plan.
+    # Columns a source does not have are skipped, since some are alternative join keys.
+    FETCH_COLUMNS = {
+        "player_stats": [
+            "player_id", "season", "week", "team", "position", "fantasy_points", "fantasy_points_ppr",
+            *[c for c in STAT_COUNT_COLS if c != "yards"], "def_sacks", "fg_pct",
+        ],
+        "schedules": ["season", "week", "home_team", "away_team", "home_score", "away_score"],
+        "injuries": ["gsis_id", "season", "week", "report_status", "report_primary_injury", "practice_status"],
+        "snap_counts": [
+            "gsis_id", "pfr_player_id", "player", "season", "week",
+            "offense_snaps", "offense_pct", "defense_snaps", "defense_pct",
+        ],
+        "contracts": ["otc_id", "year_signed", "years", "apy"],
+        "teams": ["team_abbr", "team_name", "team_conf", "team_division"],
+        "players": [
+            "gsis_id", "pfr_id", "otc_id", "display_name", "full_name", "first_name", "last_name",
+            "birth_date", "last_season",
+        ],
+        "trades": ["trade_id", "season", "trade_date", "gave", "received", "pfr_id"],
+    }
+
+    # Join-key dtypes enforced once at the load boundary, so every plan downstream
+    # can join and filter on them without re-casting
+    LOAD_DTYPES = {
+        "player_id": pl.Utf8,
+        "gsis_id": pl.Utf8,
+        "pfr_id": pl.Utf8,
+        "pfr_player_id": pl.Utf8,
+        "otc_id": pl.Utf8,
+        "season": pl.Int32,
+        "week": pl.Int32,
+    }
+
+    def __init__(self, start_year=2020, end_year=2025, output_dir="output", use_cache=True, write_parquet=False):
         self.start_year = start_year
         self.end_year = end_year
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.seasons = list(range(start_year, end_year + 1))
+        self.use_cache = use_cache
+        self.cache_dir = self.output_dir / ".cache"
+        self.write_parquet = write_parquet
+        self.parquet_dir = self.output_dir / "parquet"
 
-    def _normalize_team_name(self, df: pl.DataFrame, team_col: str) -> pl.DataFrame:
+    def _normalize_team_name(self, df: pl.LazyFrame, team_col: str) -> pl.LazyFrame:
         """
         Normalize historical team names to their current canonical names.
         This ensures relocated teams (Rams, Chargers, Raiders) have consistent teamIDs.
         """
-        # Create a mapping expression that replaces old team names with current ones
-        normalized_col = pl.col(team_col)
-        for old_name, new_name in self.TEAM_RELOCATIONS.items():
-            normalized_col = pl.when(pl.col(team_col) == old_name).then(pl.lit(new_name)).otherwise(normalized_col)
+        # Single hash-map lookup; names not in TEAM_RELOCATIONS pass through unchanged
+        return df.with_columns([pl.col(team_col).replace(self.TEAM_RELOCATIONS).alias(team_col)])
+
+    @cached_property
+    def _team_id_map(self) -> pl.LazyFrame:
+        """
+        teamID for every normalized team abbreviation.
+        Hashing the ~40 team rows once and joining keeps IDs identical to TeamMapping
+        without re-hashing the team string on every row of the larger tables.
+        """
+        teams = self.teams.lazy().select([pl.col("team_abbr").alias("team")])
+        teams = self._normalize_team_name(teams, "team").unique()
+        return teams.with_columns([pl.col("team").hash().abs().alias("teamID")])
 
-        return df.with_columns([normalized_col.alias(team_col)])
+    def _with_team_id(self, df: pl.LazyFrame, team_col: str, id_col: str) -> pl.LazyFrame:
+        team_ids = self._team_id_map.rename({"team": team_col, "teamID": id_col})
+        return df.join(team_ids, on=team_col, how="left")
+
+    def _unmatched_teams(self) -> pl.LazyFrame:
+        """
+        Normalized team abbreviations used by the source data that have no teamID.
+        Their rows get a null teamID and would fail the TeamMapping foreign key at import.
+        Only the few distinct abbreviations are compared, not the tables built from them.
+        """
+        sources = [
+            (self.player_stats, "team"),
+            (self.schedules, "home_team"),
+            (self.schedules, "away_team"),
+            (self.trades, "gave"),
+            (self.trades, "received"),
+        ]
+        teams = pl.concat([
+            df.lazy().select(pl.col(col).alias("team")).unique()
+            for df, col in sources if col in df.columns
+        ])
+        teams = self._normalize_team_name(teams, "team").drop_nulls().unique()
+        return teams.join(self._team_id_map, on="team", how="anti").sort("team")
 
     def fetch_all_data(self):
         logger.info(f"Fetching data for seasons {self.start_year}-{self.end_year}")
-        
+
+        # The loads are independent and network-bound, so run them concurrently
+        fetches = {
+            "player_stats": ("weekly player stats", lambda: self._cached_fetch(nfl.load_player_stats, "player_stats", self.seasons, summary_level="week")),
+            "rosters": ("rosters", lambda: self._cached_fetch(nfl.load_rosters, "rosters", self.seasons)),
+            "weekly_rosters": ("weekly rosters", lambda: self._cached_fetch(nfl.load_rosters_weekly, "weekly_rosters", self.seasons)),
+            "injuries": ("injury data", lambda: self._fetch_with_fallback(nfl.load_injuries, "injuries", min_year=2009)),
+            "contracts": ("contract data", lambda: self._fetch_optional(nfl.load_contracts, "contracts", "contracts")),
+            "snap_counts": ("snap counts", lambda: self._fetch_with_fallback(nfl.load_snap_counts, "snap_counts", min_year=2012)),
+            "team_stats": ("team stats", lambda: self._cached_fetch(nfl.load_team_stats, "team_stats", self.seasons, summary_level="week")),
+            "schedules": ("schedules", lambda: self._cached_fetch(nfl.load_schedules, "schedules", self.seasons)),
+            "teams": ("team information", lambda: self._prepare("teams", nfl.load_teams())),
+            "players": ("players (ID crosswalk)", lambda: self._fetch_optional(nfl.load_players, "players", "players crosswalk")),
+            "trades": ("weekly trade information", lambda: self._prepare("trades", nfl.load_trades())),
+        }
+
         try:
-            logger.info("Fetching weekly player stats...")
-            self.player_stats = nfl.load_player_stats(seasons=self.seasons, summary_level="week")
-            
-            logger.info("Fetching rosters...")
-            self.rosters = nfl.load_rosters(seasons=self.seasons)
-            
-            logger.info("Fetching weekly rosters...")
-            self.weekly_rosters = nfl.load_rosters_weekly(seasons=self.seasons)
-            
-            logger.info("Fetching injury data...")
-            self.injuries = self._fetch_with_fallback(nfl.load_injuries, "injuries", min_year=2009)
-            
-            logger.info("Fetching contract data...")
-            try:
-                self.contracts = nfl.load_contracts()
-            except Exception as e:
-                logger.warning(f"Could not fetch contracts: {e}")
-                self.contracts = pl.DataFrame()
-            
-            logger.info("Fetching snap counts...")
-            self.snap_counts = self._fetch_with_fallback(nfl.load_snap_counts, "snap_counts", min_year=2012)
-            
-            logger.info("Fetching team stats...")
-            self.team_stats = nfl.load_team_stats(seasons=self.seasons, summary_level="week")
-            
-            logger.info("Fetching schedules...")
-            self.schedules = nfl.load_schedules(seasons=self.seasons)
-            
-            logger.info("Fetching team information...")
-            self.teams = nfl.load_teams()
-
-            logger.info("Fetching players (ID crosswalk)...")
-            try:
-                self.players = nfl.load_players()
-            except Exception as e:
-                logger.warning(f"Could not fetch players crosswalk: {e}")
-                self.players = pl.DataFrame()
-
-            logger.info("Fetching weekly trade information...")
-            self.trades = nfl.load_trades()
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                futures = {}
+                for attr, (label, fetch) in fetches.items():
+                    logger.info(f"Fetching {label}...")
+                    futures[attr] = pool.submit(fetch)
+
+                for attr, future in futures.items():
+                    setattr(self, attr, future.result())
+
+            # Drop crosswalks memoized from a previous fetch
+            for attr in ("_team_id_map", "_pfr_to_gsis", "_name_to_gsis", "_otc_to_gsis"):
+                self.__dict__.pop(attr, None)
             
             logger.info("All data fetched successfully!")
             return True
@@ -93,53 +178,118 @@ class NFLDataExporter:
         except Exception as e:
             logger.error(f"Error fetching data: {e}")
             raise
+
+    def _prepare(self, data_name, df):
+        """Trim a fetched dataset to FETCH_COLUMNS and cast its keys to LOAD_DTYPES"""
+        columns = self.FETCH_COLUMNS.get(data_name)
+        if columns is not None:
+            df = df.select([c for c in columns if c in df.columns])
+        casts = [pl.col(c).cast(dtype) for c, dtype in self.LOAD_DTYPES.items() if c in df.columns]
+        return df.with_columns(casts) if casts else df
+
+    def _fetch_optional(self, fetch_func, data_name, label):
+        try:
+            return self._prepare(data_name, fetch_func())
+        except Exception as e:
+            logger.warning(f"Could not fetch {label}: {e}")
+            return pl.DataFrame()
+    
+    def _cached_fetch(self, fetch_func, data_name, seasons, **kwargs):
+        """
+        Fetch seasons, reusing a local parquet copy of the ones already finished.
+        Completed seasons never change upstream, so only the in-progress season
+        is downloaded again on later runs. Every frame returned is already
+        trimmed and cast by _prepare.
+        """
+        if not self.use_cache:
+            return self._prepare(data_name, fetch_func(seasons=seasons, **kwargs))
+
+        current_season = nfl.get_current_season()
+        frozen = [season for season in seasons if season < current_season]
+        live = [season for season in seasons if season >= current_season]
+
+        dataframes = []
+        if frozen:
+            # The cached file holds _prepare's output, so its column and dtype spec is part of the key
+            columns = self.FETCH_COLUMNS.get(data_name)
+            dtypes = sorted((c, str(dtype)) for c, dtype in self.LOAD_DTYPES.items())
+            key = hashlib.blake2b(f"{data_name}-{frozen}-{sorted(kwargs.items())}-{columns}-{dtypes}".encode()).hexdigest()[:16]
+            cache_path = self.cache_dir / f"{data_name}-{key}.parquet"
+            if cache_path.exists():
+                logger.info(f"Loaded {data_name} {frozen[0]}-{frozen[-1]} from cache")
+                dataframes.append(pl.read_parquet(cache_path))
+            else:
+                df = self._prepare(data_name, fetch_func(seasons=frozen, **kwargs))
+                if not _is_empty(df):
+                    self.cache_dir.mkdir(exist_ok=True)
+                    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+                    df.write_parquet(tmp_path, compression="zstd")
+                    os.replace(tmp_path, cache_path)
+                dataframes.append(df)
+        if live:
+            dataframes.append(self._prepare(data_name, fetch_func(seasons=live, **kwargs)))
+
+        if len(dataframes) == 1:
+            return dataframes[0]
+        return pl.concat(dataframes, how="diagonal_relaxed", rechunk=False)
     
     def _fetch_with_fallback(self, fetch_func, data_name, min_year=None):
         try:
-            return fetch_func(seasons=self.seasons)
+            return self._cached_fetch(fetch_func, data_name, self.seasons)
         except Exception as e:
             logger.warning(f"Could not fetch all {data_name} at once: {e}")
             logger.info(f"Fetching {data_name} year by year...")
             
-            dataframes = []
+            seasons = []
             for season in self.seasons:
                 if min_year and season < min_year:
                     logger.info(f"Skipping {season} (data not available before {min_year})")
                     continue
-                
+                seasons.append(season)
+
+            def fetch_season(season):
                 try:
-                    df = fetch_func(seasons=season)
-                    dataframes.append(df)
+                    df = self._cached_fetch(fetch_func, data_name, [season])
                     logger.info(f"✓ Fetched {data_name} for {season}")
+                    return df
                 except Exception as year_error:
                     logger.warning(f"✗ Could not fetch {data_name} for {season}: {year_error}")
-                    continue
+                    return None
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                dataframes = [df for df in pool.map(fetch_season, seasons) if df is not None]
             
             if dataframes:
                 logger.info(f"Successfully fetched {data_name} for {len(dataframes)} season(s)")
-                return pl.concat(dataframes, how="diagonal_relaxed")
+                return pl.concat(dataframes, how="diagonal_relaxed", rechunk=False)
             else:
                 logger.warning(f"No {data_name} data available for any season")
                 return pl.DataFrame()
 
-    def _standardize_keys(self, df: pl.DataFrame, id_col: str = "playerID") -> pl.DataFrame:
-        cols = df.columns
-        exprs = []
-        if id_col in cols:
-            exprs.append(pl.col(id_col).cast(pl.Utf8))
-        if "week" in cols:
-            exprs.append(pl.col("week").cast(pl.Int32))
-        if "year" in cols:
-            exprs.append(pl.col("year").cast(pl.Int32))
-        if not exprs:
-            return df
-        return df.with_columns(exprs)
-
-    def _map_snap_counts_to_gsis(self) -> pl.DataFrame:
-        if len(self.snap_counts) == 0:
-            return pl.DataFrame()
+    @cached_property
+    def _pfr_to_gsis(self) -> pl.LazyFrame:
+        return self.players.lazy().select([pl.col("pfr_id"), pl.col("gsis_id")]).filter(pl.col("gsis_id").is_not_null())\
+            .unique(subset=["pfr_id"], keep="first")
+
+    @cached_property
+    def _name_to_gsis(self) -> pl.LazyFrame:
+        return self.players.lazy().select([pl.col("full_name"), pl.col("gsis_id")]).filter(pl.col("gsis_id").is_not_null())\
+            .unique(subset=["full_name"], keep="first")
 
-        sc = self.snap_counts
+    @cached_property
+    def _otc_to_gsis(self) -> pl.LazyFrame:
+        otc_map = self.players.lazy().select([
+            pl.col("gsis_id").alias("playerID"),
+            pl.col("otc_id")
+        ]).filter(pl.col("otc_id").is_not_null() & pl.col("playerID").is_not_null())
+        # One player per otc_id, so joins on it cannot fan rows out
+        return otc_map.unique(subset=["otc_id"], keep="first")
+
+    def _map_snap_counts_to_gsis(self) -> pl.LazyFrame | None:
+        if _is_empty(self.snap_counts):
+            return None
+
+        sc = self.snap_counts.lazy()
         base_cols = [
             pl.col("week"),
             pl.col("season").alias("year"),
@@ -149,30 +299,28 @@ class NFLDataExporter:
             pl.col("defense_pct"),
         ]
 
-        if "gsis_id" in sc.columns:
+        if "gsis_id" in self.snap_counts.columns:
             out = sc.select([pl.col("gsis_id").alias("playerID"), *base_cols])
-            return self._standardize_keys(out)
+            return out
 
         # Snap counts use 'pfr_player_id' column, not 'pfr_id'
-        if "pfr_player_id" in sc.columns and len(self.players) > 0 and "pfr_id" in self.players.columns and "gsis_id" in self.players.columns:
-            pmap = self.players.select([pl.col("pfr_id"), pl.col("gsis_id")]).filter(pl.col("gsis_id").is_not_null())
-            out = sc.join(pmap, left_on="pfr_player_id", right_on="pfr_id", how="left").select([pl.col("gsis_id").alias("playerID"), *base_cols])
-            return self._standardize_keys(out)
+        if "pfr_player_id" in self.snap_counts.columns and not _is_empty(self.players) and "pfr_id" in self.players.columns and "gsis_id" in self.players.columns:
+            out = sc.join(self._pfr_to_gsis, left_on="pfr_player_id", right_on="pfr_id", how="left").select([pl.col("gsis_id").alias("playerID"), *base_cols])
+            return out
 
-        if "player" in sc.columns and len(self.players) > 0 and "full_name" in self.players.columns and "gsis_id" in self.players.columns:
-            pmap = self.players.select([pl.col("full_name"), pl.col("gsis_id")]).filter(pl.col("gsis_id").is_not_null())
-            out = sc.join(pmap, left_on="player", right_on="full_name", how="left").select([pl.col("gsis_id").alias("playerID"), *base_cols])
-            return self._standardize_keys(out)
+        if "player" in self.snap_counts.columns and not _is_empty(self.players) and "full_name" in self.players.columns and "gsis_id" in self.players.columns:
+            out = sc.join(self._name_to_gsis, left_on="player", right_on="full_name", how="left").select([pl.col("gsis_id").alias("playerID"), *base_cols])
+            return out
 
         logger.warning("Could not map snap counts to GSIS IDs; playTime will be null")
-        return pl.DataFrame()
+        return None
 
-    def _contracts_by_year_df(self) -> pl.DataFrame:
-        if len(self.contracts) == 0:
-            return pl.DataFrame()
+    def _contracts_by_year_df(self) -> pl.LazyFrame | None:
+        if _is_empty(self.contracts):
+            return None
 
-        contracts = self.contracts.select([
-            pl.col("otc_id").cast(pl.Utf8).alias("otc_id"),
+        contracts = self.contracts.lazy().select([
+            pl.col("otc_id"),
             pl.col("year_signed"),
             pl.col("years"),
             pl.col("apy"),
@@ -183,28 +331,32 @@ class NFLDataExporter:
         ])
 
         contracts = contracts.with_columns([
-            pl.int_ranges(pl.col("year_signed"), pl.col("year_signed") + pl.col("years")).alias("year_list"),
             pl.date(pl.col("year_signed"), 3, 1).alias("contractCreateDate"),
             pl.date(pl.col("year_signed") + pl.col("years"), 3, 1).alias("contractExpireDate"),
         ])
 
-        contracts_by_year = contracts.explode("year_list").rename({"year_list": "year"})\
-            .select([
-                pl.col("otc_id"),
-                pl.col("year").cast(pl.Int32),
-                pl.col("apy").alias("contractSalary"),
-                pl.col("contractCreateDate"),
-                pl.col("contractExpireDate"),
-                pl.col("year_signed"),
-                pl.col("years"),
-            ])
+        # Fan each contract out to the exported seasons it covers with a range join,
+        # rather than exploding a list of every year of the deal
+        seasons = pl.LazyFrame({"year": self.seasons}, schema={"year": pl.Int32})
+        contracts_by_year = contracts.join_where(
+            seasons,
+            pl.col("year") >= pl.col("year_signed"),
+            pl.col("year") < pl.col("year_signed") + pl.col("years"),
+        ).select([
+            pl.col("otc_id"),
+            pl.col("year"),
+            pl.col("apy").alias("contractSalary"),
+            pl.col("contractCreateDate"),
+            pl.col("contractExpireDate"),
+            pl.col("year_signed"),
+            pl.col("years"),
+        ])
 
         return contracts_by_year
     
-    def create_weekly_player_data(self):
-        logger.info("Creating WeeklyPlayerData...")
-
-        df = self.player_stats.select([
+    def _player_stats_base(self) -> pl.LazyFrame:
+        """Weekly stat columns shared by WeeklyPlayerData and HistoricPlayerData"""
+        df = self.player_stats.lazy().select([
             pl.col("player_id").alias("playerID"),
             pl.col("week"),
             pl.col("season").alias("year"),
@@ -262,11 +414,20 @@ class NFLDataExporter:
             pl.col("punt_returns"),
             pl.col("punt_return_yards"),
         ])
-        df = self._standardize_keys(df)
+        return df.with_columns(
+            [pl.col("position").cast(pl.Categorical)] +
+            [pl.col(c).cast(pl.Int16) for c in self.STAT_COUNT_COLS] +
+            [pl.col(c).cast(pl.Float32) for c in self.STAT_FLOAT_COLS]
+        )
+
+    def create_weekly_player_data(self):
+        logger.info("Creating WeeklyPlayerData...")
+
+        df = self._player_stats_base()
         
-        # Normalize team names for relocated teams before hashing
+        # Normalize team names for relocated teams before looking up teamID
         df = self._normalize_team_name(df, "team")
-        df = df.with_columns([pl.col("team").hash().abs().alias("teamID")])
+        df = self._with_team_id(df, "team", "teamID")
 
         # 3NF: Remove injuryStatus and playTime - they belong in separate normalized tables
         final_df = df.select([
@@ -288,73 +449,12 @@ class NFLDataExporter:
             "kickoff_returns", "kickoff_return_yards", "punt_returns", "punt_return_yards",
         ])
 
-        output_path = self.output_dir / "WeeklyPlayerData.csv"
-        final_df.write_csv(output_path)
-        logger.info(f"WeeklyPlayerData saved to {output_path} ({len(final_df)} rows)")
-
         return final_df
     
     def create_historic_player_data(self):
         logger.info("Creating HistoricPlayerData...")
 
-        df = self.player_stats.select([
-            pl.col("player_id").alias("playerID"),
-            pl.col("season").alias("year"),
-            pl.col("team").alias("team"),
-            pl.col("position"),
-            pl.col("fantasy_points").alias("ppg"),
-            pl.col("fantasy_points_ppr").alias("ppg_ppr"),
-            (pl.col("passing_yards").fill_null(0) +
-             pl.col("rushing_yards").fill_null(0) +
-             pl.col("receiving_yards").fill_null(0)).alias("yards"),
-            # Passing stats
-            pl.col("completions"),
-            pl.col("attempts"),
-            pl.col("passing_yards"),
-            pl.col("passing_tds"),
-            pl.col("passing_interceptions"),
-            pl.col("sacks_suffered"),
-            pl.col("sack_yards_lost"),
-            # Rushing stats
-            pl.col("carries"),
-            pl.col("rushing_yards"),
-            pl.col("rushing_tds"),
-            pl.col("rushing_fumbles"),
-            pl.col("rushing_fumbles_lost"),
-            # Receiving stats
-            pl.col("receptions"),
-            pl.col("targets"),
-            pl.col("receiving_yards"),
-            pl.col("receiving_tds"),
-            pl.col("receiving_fumbles"),
-            pl.col("receiving_fumbles_lost"),
-            # Defensive stats
-            pl.col("def_tackles_solo"),
-            pl.col("def_tackles_with_assist"),
-            pl.col("def_tackle_assists"),
-            pl.col("def_tackles_for_loss"),
-            pl.col("def_sacks"),
-            pl.col("def_sack_yards"),
-            pl.col("def_qb_hits"),
-            pl.col("def_interceptions"),
-            pl.col("def_interception_yards"),
-            pl.col("def_pass_defended"),
-            pl.col("def_fumbles_forced"),
-            pl.col("def_fumbles"),
-            pl.col("def_tds"),
-            # Kicking stats
-            pl.col("fg_made"),
-            pl.col("fg_att"),
-            pl.col("fg_pct"),
-            pl.col("pat_made"),
-            pl.col("pat_att"),
-            # Return stats
-            pl.col("kickoff_returns"),
-            pl.col("kickoff_return_yards"),
-            pl.col("punt_returns"),
-            pl.col("punt_return_yards"),
-        ])
-        df = self._standardize_keys(df)
+        df = self._player_stats_base()
 
         df = df.group_by(["playerID", "year", "team", "position"]).agg([
             pl.col("ppg").mean().alias("ppg"),
@@ -408,9 +508,9 @@ class NFLDataExporter:
             pl.col("punt_return_yards").sum().alias("punt_return_yards"),
         ])
 
-        # Normalize team names for relocated teams before hashing
+        # Normalize team names for relocated teams before looking up teamID
         df = self._normalize_team_name(df, "team")
-        df = df.with_columns([pl.col("team").hash().abs().alias("teamID")])
+        df = self._with_team_id(df, "team", "teamID")
 
         # 3NF: Remove injuryStatus and playTime - they belong in separate normalized tables
         final_df = df.select([
@@ -432,68 +532,60 @@ class NFLDataExporter:
             "kickoff_returns", "kickoff_return_yards", "punt_returns", "punt_return_yards",
         ])
 
-        output_path = self.output_dir / "HistoricPlayerData.csv"
-        final_df.write_csv(output_path)
-        logger.info(f"HistoricPlayerData saved to {output_path} ({len(final_df)} rows)")
-
         return final_df
     
     def create_weekly_team_data(self):
         logger.info("Creating WeeklyTeamData...")
         
-        df = self.schedules.select([
-            pl.col("season").alias("year"),
-            pl.col("week"),
-            pl.col("home_team").alias("team"),
-            pl.col("home_score").alias("pointsFor"),
-            pl.col("away_score").alias("pointsAgainst"),
-            (pl.col("home_score") - pl.col("away_score")).alias("home_result")
-        ])
-        
-        df_away = self.schedules.select([
+        # One row per team per game: explode a [home, away] pair built in a single
+        # pass over the schedule instead of selecting it twice and concatenating.
+        # Games without a week are dropped at the scan; a filter placed after the
+        # cum_sum windows below cannot be pushed down past them.
+        df = self.schedules.lazy().filter(pl.col("week").is_not_null()).select([
             pl.col("season").alias("year"),
             pl.col("week"),
-            pl.col("away_team").alias("team"),
-            pl.col("away_score").alias("pointsFor"),
-            pl.col("home_score").alias("pointsAgainst"),
-            (pl.col("away_score") - pl.col("home_score")).alias("home_result")
-        ])
-        
-        df = pl.concat([df, df_away])
-        df = df.sort(["team", "year", "week"])
-        
-        df = df.with_columns([
-            pl.when(pl.col("home_result") > 0).then(1).otherwise(0).alias("is_win"),
-            pl.when(pl.col("home_result") < 0).then(1).otherwise(0).alias("is_loss"),
-            pl.when(pl.col("home_result") == 0).then(1).otherwise(0).alias("is_tie")
-        ])
-        
+            pl.concat_list([
+                pl.struct([
+                    pl.col("home_team").alias("team"),
+                    pl.col("home_score").alias("pointsFor"),
+                    pl.col("away_score").alias("pointsAgainst"),
+                ]),
+                pl.struct([
+                    pl.col("away_team").alias("team"),
+                    pl.col("away_score").alias("pointsFor"),
+                    pl.col("home_score").alias("pointsAgainst"),
+                ]),
+            ]).alias("side"),
+        ]).explode("side").unnest("side")
+        df = df.with_columns([(pl.col("pointsFor") - pl.col("pointsAgainst")).alias("home_result")])
+        
+        # Classify each game once by the sign of its margin (1 win, -1 loss, 0 tie);
+        # unplayed games have a null margin and count towards none of the three
+        df = df.with_columns([pl.col("home_result").sign().cast(pl.Int8).alias("result_sign")])
+
+        # Keep the three running totals in one with_columns: windows over identical
+        # partition keys share a single group computation there. order_by="week" orders
+        # each team-season's running total, so no global sort of the frame is needed
         df = df.with_columns([
-            pl.col("is_win").cum_sum().over(["team", "year"]).alias("wins"),
-            pl.col("is_loss").cum_sum().over(["team", "year"]).alias("losses"),
-            pl.col("is_tie").cum_sum().over(["team", "year"]).alias("ties")
+            (pl.col("result_sign") == 1).fill_null(False).cast(pl.Int8).cum_sum().over(["team", "year"], order_by="week").alias("wins"),
+            (pl.col("result_sign") == -1).fill_null(False).cast(pl.Int8).cum_sum().over(["team", "year"], order_by="week").alias("losses"),
+            (pl.col("result_sign") == 0).fill_null(False).cast(pl.Int8).cum_sum().over(["team", "year"], order_by="week").alias("ties")
         ])
 
-        # Normalize team names for relocated teams before hashing
+        # Normalize team names for relocated teams before looking up teamID
         df = self._normalize_team_name(df, "team")
-        df = df.with_columns([pl.col("team").hash().abs().alias("teamID")])
+        df = self._with_team_id(df, "team", "teamID")
         
         final_df = df.select([
             "teamID", "week", "year", "wins", "losses", "ties", "pointsFor", "pointsAgainst"
         ])
         
-        final_df = final_df.filter(pl.col("week").is_not_null())
-        
-        output_path = self.output_dir / "WeeklyTeamData.csv"
-        final_df.write_csv(output_path)
-        logger.info(f"WeeklyTeamData saved to {output_path} ({len(final_df)} rows)")
-        
         return final_df
     
     def create_team_mapping(self):
         logger.info("Creating team mapping reference...")
 
-        base = self.teams.select([
+        base = self.teams.lazy().select([
             pl.col("team_abbr"),
             pl.col("team_name"),
             pl.col("team_conf"),
@@ -504,34 +596,33 @@ class NFLDataExporter:
         base = self._normalize_team_name(base, "team_abbr")
         base = self._normalize_team_name(base, "team_name")
 
-        # Derive nickname ("name") as the last word and "city" as everything before it
+        # Derive nickname ("name") as the last word and "city" as everything before it;
+        # single-word names have no city and are left null, as before
+        words = pl.col("team_name").str.split(" ")
+        has_city = words.list.len() > 1
         enriched = base.with_columns([
-            pl.col("team_name").str.extract(r"^(.+?)\s+([^\s]+)$", group_index=2).alias("name"),
-            pl.col("team_name").str.extract(r"^(.+?)\s+([^\s]+)$", group_index=1).alias("city"),
+            pl.when(has_city).then(words.list.last()).alias("name"),
+            pl.when(has_city).then(words.list.head(words.list.len() - 1).list.join(" ")).alias("city"),
         ])
 
         # Remove duplicate entries by keeping only unique team_abbr values
         enriched = enriched.unique(subset=["team_abbr"])
 
-        teams_final = enriched.select([
-            pl.col("team_abbr").hash().abs().alias("teamID"),
+        teams_final = self._with_team_id(enriched, "team_abbr", "teamID").select([
+            pl.col("teamID"),
             pl.col("name"),
             pl.col("city"),
             pl.col("team_conf").alias("conference"),
             pl.col("team_division").alias("division"),
         ])
         
-        output_path = self.output_dir / "TeamMapping.csv"
-        teams_final.write_csv(output_path)
-        logger.info(f"Team mapping saved to {output_path}")
-        
         return teams_final
     
     def create_player_mapping(self):
         logger.info("Creating player mapping reference...")
         
         # Filter by last_season >= start_year or null, then select columns
-        players_df = self.players.filter(
+        players_df = self.players.lazy().filter(
             (pl.col("last_season") >= self.start_year) | (pl.col("last_season").is_null())
         ).select([
             pl.col("gsis_id").alias("playerID"),
@@ -542,34 +633,24 @@ class NFLDataExporter:
             pl.col("birth_date"),
         ]).unique(subset=["playerID"])
         
-        output_path = self.output_dir / "PlayerMapping.csv"
-        players_df.write_csv(output_path)
-        logger.info(f"Player mapping saved to {output_path}")
-        
         return players_df
 
     def create_player_contracts(self):
-        """Create PlayerContracts.csv - all contract data for each player-year combination"""
+        """Build the PlayerContracts plan - all contract data for each player-year combination"""
         logger.info("Creating PlayerContracts...")
         
-        if len(self.contracts) == 0 or not hasattr(self, "players") or len(self.players) == 0:
+        if _is_empty(self.contracts) or not hasattr(self, "players") or _is_empty(self.players):
             logger.warning("No contract data or player crosswalk available")
-            return pl.DataFrame()
-        
-        # Get the otc_id to gsis_id mapping
-        otc_map = self.players.select([
-            pl.col("gsis_id").alias("playerID"),
-            pl.col("otc_id")
-        ]).filter(pl.col("otc_id").is_not_null())
+            return None
         
         # Get all contracts by year (this includes all contracts, not deduplicated)
         contracts_by_year = self._contracts_by_year_df()
-        if len(contracts_by_year) == 0:
+        if contracts_by_year is None:
             logger.warning("No contract data available after processing")
-            return pl.DataFrame()
+            return None
         
         # Join with player mapping to get playerID (gsis_id)
-        contracts_df = contracts_by_year.join(otc_map, on="otc_id", how="inner")
+        contracts_df = contracts_by_year.join(self._otc_to_gsis, on="otc_id", how="inner")
         
         # Select final columns
         final_df = contracts_df.select([
@@ -582,29 +663,24 @@ class NFLDataExporter:
             pl.col("years").alias("contract_years"),
         ])
         
-        output_path = self.output_dir / "PlayerContracts.csv"
-        final_df.write_csv(output_path)
-        logger.info(f"PlayerContracts saved to {output_path} ({len(final_df)} rows)")
-        
         return final_df
 
     def create_injury_data(self):
-        """Create InjuryData.csv - 3NF normalized injury status table"""
+        """Build the InjuryData plan - 3NF normalized injury status table"""
         logger.info("Creating InjuryData...")
         
-        if len(self.injuries) == 0:
+        if _is_empty(self.injuries):
             logger.warning("No injury data available")
-            return pl.DataFrame()
+            return None
         
-        injury_df = self.injuries.select([
+        injury_df = self.injuries.lazy().select([
             pl.col("gsis_id").alias("playerID"),
             pl.col("week"),
             pl.col("season").alias("year"),
-            pl.col("report_status").alias("injuryStatus"),
-            pl.col("report_primary_injury").alias("primaryInjury"),
-            pl.col("practice_status").alias("practiceStatus"),
+            pl.col("report_status").cast(pl.Categorical).alias("injuryStatus"),
+            pl.col("report_primary_injury").cast(pl.Categorical).alias("primaryInjury"),
+            pl.col("practice_status").cast(pl.Categorical).alias("practiceStatus"),
         ])
-        injury_df = self._standardize_keys(injury_df)
         
         # Filter out rows without valid keys
         injury_df = injury_df.filter(
@@ -617,20 +693,16 @@ class NFLDataExporter:
         # Deduplicate by primary key
         injury_df = injury_df.unique(subset=["playerID", "week", "year"], keep="first")
         
-        output_path = self.output_dir / "InjuryData.csv"
-        injury_df.write_csv(output_path)
-        logger.info(f"InjuryData saved to {output_path} ({len(injury_df)} rows)")
-        
         return injury_df
 
     def create_snap_counts(self):
-        """Create SnapCounts.csv - 3NF normalized snap count table"""
+        """Build the SnapCounts plan - 3NF normalized snap count table"""
         logger.info("Creating SnapCounts...")
         
         mapped_snaps = self._map_snap_counts_to_gsis()
-        if len(mapped_snaps) == 0:
+        if mapped_snaps is None:
             logger.warning("No snap count data available")
-            return pl.DataFrame()
+            return None
         
         snap_df = mapped_snaps.select([
             "playerID",
@@ -653,17 +725,13 @@ class NFLDataExporter:
         # Deduplicate by primary key
         snap_df = snap_df.unique(subset=["playerID", "week", "year"], keep="first")
         
-        output_path = self.output_dir / "SnapCounts.csv"
-        snap_df.write_csv(output_path)
-        logger.info(f"SnapCounts saved to {output_path} ({len(snap_df)} rows)")
-        
         return snap_df
 
     def create_trade_data(self):
-        """Create TradeTable.csv - 3NF normalized (player_name removed, use PlayerMapping)"""
+        """Build the TradeTable plan - 3NF normalized (player_name removed, use PlayerMapping)"""
         logger.info("Creating trade data table...")
 
-        trades_df = self.trades.select([
+        trades_df = self.trades.lazy().select([
             pl.col("trade_id"),
             pl.col("season"),
             pl.col("trade_date").alias("date"),
@@ -673,42 +741,65 @@ class NFLDataExporter:
             # 3NF: player_name removed - can be joined from PlayerMapping
         ])
 
-        # Normalize team names for relocated teams before hashing
+        # Normalize team names for relocated teams before looking up teamID
         trades_df = self._normalize_team_name(trades_df, "gave")
         trades_df = self._normalize_team_name(trades_df, "received")
 
-        # Now hash the normalized team names
-        trades_df = trades_df.with_columns([
-            pl.col("gave").hash().abs().alias("team_gave"),
-            pl.col("received").hash().abs().alias("team_received"),
-        ]).select([
+        trades_df = self._with_team_id(trades_df, "gave", "team_gave")
+        trades_df = self._with_team_id(trades_df, "received", "team_received").select([
             "trade_id", "season", "date", "team_gave", "team_received", "playerID"
         ])
 
-        output_path = self.output_dir / "TradeTable.csv"
-        trades_df.write_csv(output_path)
-        logger.info(f"Trade data saved to {output_path}")
-
         return trades_df
     
     def export_all(self):
         try:
             self.fetch_all_data()
             
-            # Core player/team data
-            self.create_weekly_player_data()
-            self.create_historic_player_data()
-            self.create_weekly_team_data()
-            
-            # Reference/mapping tables
-            self.create_team_mapping()
-            self.create_player_mapping()
-            
-            # 3NF normalized tables
-            self.create_player_contracts()
-            self.create_injury_data()
-            self.create_snap_counts()
-            self.create_trade_data()
+            plans = {
+                # Core player/team data
+                "WeeklyPlayerData": self.create_weekly_player_data(),
+                "HistoricPlayerData": self.create_historic_player_data(),
+                "WeeklyTeamData": self.create_weekly_team_data(),
+                # Reference/mapping tables
+                "TeamMapping": self.create_team_mapping(),
+                "PlayerMapping": self.create_player_mapping(),
+                # 3NF normalized tables
+                "PlayerContracts": self.create_player_contracts(),
+                "InjuryData": self.create_injury_data(),
+                "SnapCounts": self.create_snap_counts(),
+                "TradeTable": self.create_trade_data(),
+            }
+            plans = {name: lf for name, lf in plans.items() if lf is not None}
+
+            # Stream every table to disk in one optimized multi-query run so shared
+            # inputs (e.g. player_stats) are scanned once and plans run in parallel
+            output_paths = {name: self.output_dir / f"{name}.csv" for name in plans}
+            logger.info(f"Writing {len(plans)} tables...")
+            # Each table's sinks and row count read one cached copy of it, so counting
+            # adds no recomputation of the table
+            plans = {name: lf.cache() for name, lf in plans.items()}
+            sinks = [lf.sink_csv(output_paths[name], lazy=True) for name, lf in plans.items()]
+            counts = [lf.select(pl.len()) for lf in plans.values()]
+            if self.write_parquet:
+                # Raw-export Parquet goes in its own folder so CSVCleaner never mistakes
+                # it for the cleaned Parquet sibling it keeps next to each CSV
+                self.parquet_dir.mkdir(exist_ok=True)
+                sinks += [
+                    lf.sink_parquet(self.parquet_dir / f"{name}.parquet", compression="zstd", statistics=True, lazy=True)
+                    for name, lf in plans.items()
+                ]
+            # The team check rides along in the same run and is reported once it finishes
+            results = pl.collect_all([*sinks, *counts, self._unmatched_teams()])
+            row_counts = [df.item() for df in results[len(sinks):-1]]
+            unmatched = results[-1]
+            if not unmatched.is_empty():
+                logger.warning(f"No teamID for team abbreviation(s) {unmatched['team'].to_list()}; teamID will be null for their rows")
+
+            for (name, output_path), row_count in zip(output_paths.items(), row_counts):
+                logger.info(f"{name} saved to {output_path} ({row_count} rows)")
+            if self.write_parquet:
+                logger.info(f"Parquet copies saved to {self.parquet_dir}/")
             
             logger.info(f"✓ All data exported successfully to {self.output_dir}/")
             logger.info("\nGenerated files:")
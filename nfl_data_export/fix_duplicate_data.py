@@ -7,8 +7,23 @@ This script:
 3. Extracts snap counts to SnapCounts.csv (3NF normalization)
 4. Removes extracted columns and deduplicates player data tables
 5. Removes player_name from TradeTable (3NF - use PlayerMapping)
+
+All of the above is planned lazily and run at the end in one collect_all.
+
+With output_format="parquet" every table is read from and written to
+<data_dir>/parquet/<name>.parquet instead (falling back to the CSV as input
+when no Parquet copy exists yet). CSV stays the default since
+sql/fast_import.sql loads the CSV files.
+
+With partition_by_year=True the player tables are written as one file per
+season under <data_dir>/<name>/year=<year>/ (read them back with
+pl.scan_csv("<name>/**/*.csv")), so no single file handle serializes the
+largest writes. Their unpartitioned files are left untouched in that mode.
 """
 
+import csv
+import os
+import shutil
 import polars as pl
 from pathlib import Path
 import logging
@@ -16,182 +31,454 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+NULL_VALUES = ["", "NA", "NaN"]
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+# Inputs larger than this are split once into Parquet hash shards of roughly this
+# size and deduplicated shard by shard, so only one shard's groups are held in memory
+DEDUP_SHARD_BYTES = 1 << 30
+
+# Types of the key and extracted columns, so the CSV parser doesn't have to infer
+# (and possibly upcast) them; the remaining stat columns are still inferred
+_PLAYER_SCHEMA = {
+    "playerID": pl.Categorical(),  # repeated in every row; dedup hashes the u32 code
+    "week": pl.Int8,
+    "year": pl.Int16,
+    "teamID": pl.UInt64,  # can exceed i64 range
+    "contractSalary": pl.Float64,
+    "contractCreateDate": pl.Utf8,
+    "contractExpireDate": pl.Utf8,
+    "injuryStatus": pl.Categorical(),
+    "playTime": pl.Utf8,
+}
+
+SCHEMA_OVERRIDES = {
+    "HistoricPlayerData": {c: t for c, t in _PLAYER_SCHEMA.items() if c != "week"},
+    "WeeklyPlayerData": _PLAYER_SCHEMA,
+    "TradeTable": {
+        "season": pl.Int16,
+        "team_gave": pl.UInt64,  # hashed team ID
+        "team_received": pl.UInt64,
+        "playerID": pl.Categorical(),
+    },
+}
+
+# Rows serialized per CSV write batch (Polars defaults to 1024); larger batches amortize
+# the per-batch formatting and write(2) overhead across many more rows
+SINK_BATCH_SIZE = 64_000
+
+# Columns of the PlayerContracts extract, typed by _PLAYER_SCHEMA
+CONTRACT_COLUMNS = ("playerID", "year", "contractSalary", "contractCreateDate", "contractExpireDate")
+
+# Columns moved out of the player tables into their own 3NF tables
+EXTRACTED_COLUMNS = ("contractSalary", "contractCreateDate", "contractExpireDate", "injuryStatus", "playTime")
+
+# Tables written one file per season with partition_by_year=True
+PARTITIONED_TABLES = ("HistoricPlayerData", "WeeklyPlayerData")
+
+
+def _table_path(data_dir: Path, name: str, output_format: str) -> Path:
+    """Where a table is written for the given output format"""
+    if output_format == "parquet":
+        return data_dir / "parquet" / f"{name}.parquet"
+    return data_dir / f"{name}.csv"
+
+
+def _partition_dir(data_dir: Path, name: str, output_format: str) -> Path:
+    """Directory a table is written to, one file per year, with partition_by_year=True"""
+    if output_format == "parquet":
+        return data_dir / "parquet" / name
+    return data_dir / name
+
+
+def _source_path(data_dir: Path, name: str, output_format: str) -> Path:
+    """Where a table is read from: its Parquet copy when one exists in parquet mode, else the CSV"""
+    file_path = _table_path(data_dir, name, output_format)
+    return file_path if file_path.exists() else data_dir / f"{name}.csv"
+
+
+def _columns(file_path: Path) -> list[str]:
+    """A table's column names, from the CSV header line or the Parquet footer, without parsing any rows"""
+    if file_path.suffix == ".parquet":
+        return list(pl.read_parquet_schema(file_path))
+    with file_path.open(newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _scan(file_path: Path, name: str, header: list[str]) -> pl.LazyFrame:
+    """Lazily scan table name, whose columns are header, so each query below only reads the columns it uses"""
+    if file_path.suffix == ".parquet":
+        return pl.scan_parquet(file_path)
+    # Only override columns the file still has: a rerun scans tables whose 3NF columns are gone
+    schema_overrides = {c: t for c, t in SCHEMA_OVERRIDES.get(name, {}).items() if c in header}
+    return pl.scan_csv(
+        file_path,
+        infer_schema_length=10000,
+        null_values=NULL_VALUES,
+        schema_overrides=schema_overrides,
+        rechunk=False,
+    )
+
+
+def _sink(lf: pl.LazyFrame, target: Path | pl.PartitionByKey, output_format: str) -> pl.LazyFrame:
+    """Deferred streaming write of lf to a file or partitioned directory, to be run by collect_all"""
+    if output_format == "parquet":
+        return lf.sink_parquet(target, compression="zstd", row_group_size=100_000, mkdir=True, lazy=True)
+    return lf.sink_csv(target, batch_size=SINK_BATCH_SIZE, mkdir=True, lazy=True)
+
+
+def _remove(path: Path):
+    """Delete a file or a partitioned table directory, if present"""
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _first_per_key(lf: pl.LazyFrame, pk: list[str], columns: list[str]) -> pl.LazyFrame:
+    """
+    The first row of each pk, like unique(subset=pk, keep="first"), as a group_by().first():
+    only the key is hashed, and the group-by has a streaming implementation. Row order
+    on disk doesn't matter, only column order, which the final select restores.
+    """
+    return lf.group_by(pk, maintain_order=False).agg(pl.exclude(pk).first()).select(columns)
+
+
+def _duplicated_keys(lf: pl.LazyFrame, pk: list[str]) -> pl.LazyFrame:
+    """
+    Hashes of the pk values that occur more than once in lf. A key-only count that
+    holds one u64 per key instead of a full row per key; colliding hashes only add
+    candidates, never drop a duplicate. Stays lazy, so it runs inside the main plan.
+    """
+    return (
+        lf.select(pl.struct(pk).hash().alias("_key_hash"))
+          .group_by("_key_hash").len()
+          .filter(pl.col("len") > 1)
+          .select("_key_hash")
+    )
+
+
+def _shard(lf: pl.LazyFrame, pk: list[str], shards: int, shard_dir: Path) -> list[pl.LazyFrame]:
+    """
+    Write lf once into Parquet files split by a hash of the first PK column, one
+    directory per shard, and return a scan of each shard. Every row of a key lands in
+    the same shard. This is a pass of its own, run while planning: the input is parsed
+    once here, and the plan then reads the much cheaper Parquet shards instead.
+    """
+    lf.with_columns((pl.col(pk[0]).hash() % shards).alias("_shard")).sink_parquet(
+        pl.PartitionByKey(shard_dir, by="_shard", include_key=False),
+        mkdir=True,
+        engine="streaming",
+    )
+    return [pl.scan_parquet(d / "*.parquet", hive_partitioning=False) for d in sorted(shard_dir.iterdir())]
+
+
+def _dedup_shard(lf: pl.LazyFrame, pk: list[str], columns: list[str]) -> pl.LazyFrame:
+    """
+    _first_per_key for one shard: rows whose key occurs once pass straight through and
+    only the duplicate candidates are grouped. The key count reads just the PK columns
+    of the shard's Parquet file, and the shard is read again on each side of the split.
+    """
+    duplicated = _duplicated_keys(lf, pk)
+    keyed = lf.with_columns(pl.struct(pk).hash().alias("_key_hash"))
+    unique_rows = keyed.join(duplicated, on="_key_hash", how="anti").drop("_key_hash")
+    candidates = keyed.join(duplicated, on="_key_hash", how="semi").drop("_key_hash")
+    return pl.concat([unique_rows, _first_per_key(candidates, pk, columns)])
 
-def fix_historic_player_data(data_dir: Path):
-    """Fix HistoricPlayerData.csv - extract contracts/injury/playtime and deduplicate"""
-    file_path = data_dir / "HistoricPlayerData.csv"
+
+def _dedup(lf: pl.LazyFrame, shard_lfs: list[pl.LazyFrame], pk: list[str], columns: list[str]) -> pl.LazyFrame:
+    """
+    _first_per_key over lf's columns, or shard by shard when the input was split by
+    _load. The shards are deduplicated one after another and concatenated, so only one
+    shard's groups are held in memory at a time.
+    """
+    if not shard_lfs:
+        return _first_per_key(lf.select(columns), pk, columns)
+    return pl.concat([_dedup_shard(s.select(columns), pk, columns) for s in shard_lfs], parallel=False)
+
+
+def _load(plan: "_Plan", file_path: Path, name: str, header: list[str], pk: list[str]) -> tuple[pl.LazyFrame, list[pl.LazyFrame]]:
+    """
+    Table name as one cached frame that every query built from it shares, so it is read
+    once, plus its dedup shards when the file is larger than DEDUP_SHARD_BYTES (an empty
+    list otherwise). A sharded table's cached frame reads the shards back, so the CSV
+    itself is only parsed by _shard.
+    """
+    lf = _scan(file_path, name, header)
+    shards = -(-file_path.stat().st_size // DEDUP_SHARD_BYTES)
+    if shards <= 1:
+        return lf.cache(), []
+    
+    logger.info(f"  Splitting {file_path.name} into {shards} Parquet shards for the dedup...")
+    shard_lfs = _shard(lf, pk, shards, plan.scratch_dir(name))
+    return pl.concat(shard_lfs).cache(), shard_lfs
+
+
+def _extract(lf: pl.LazyFrame, columns: set[str], cols: list[str], value_col: str, pk: list[str] | None = None) -> pl.LazyFrame:
+    """
+    The rows of lf with value_col set, projected to those of cols present in columns and
+    deduplicated on pk when given. Filtering before the projection and the unique lets the
+    scan apply the null check while parsing just these columns, so the dedup only hashes
+    the rows that survive it.
+    """
+    available_cols = [c for c in cols if c in columns]
+    extract_lf = lf.filter(pl.col(value_col).is_not_null()).select(available_cols)
+    if pk is not None:
+        extract_lf = _first_per_key(extract_lf, pk, available_cols)
+    return extract_lf
+
+
+def _extract_contracts(lf: pl.LazyFrame, columns: set[str]) -> pl.LazyFrame:
+    """
+    The rows of lf with a contractSalary, as CONTRACT_COLUMNS in _PLAYER_SCHEMA types (a
+    column the file lacks is null-filled), so both player tables' extracts share one known
+    schema and stack with a vertical concat.
+    """
+    return lf.filter(pl.col("contractSalary").is_not_null()).select([
+        (pl.col(c) if c in columns else pl.lit(None)).cast(_PLAYER_SCHEMA[c]).alias(c)
+        for c in CONTRACT_COLUMNS
+    ])
+
+
+class _Plan:
+    """
+    Every query and table write of the script, gathered lazily by the fix_* and create_*
+    steps and run as one DAG by a single collect_all. Each input is read through one
+    cached scan shared by all the tables built from it, and the outputs stream to disk
+    without the extracted tables being materialized in between.
+    """
+
+    def __init__(self, data_dir: Path, output_format: str, partition_by_year: bool = False):
+        self.data_dir = data_dir
+        self.output_format = output_format
+        self.partition_by_year = partition_by_year
+        self.queries: dict[str, pl.LazyFrame] = {}
+        self.outputs: dict[str, pl.LazyFrame] = {}
+        self.scratch_dirs: list[Path] = []
+
+    def write(self, name: str, lf: pl.LazyFrame):
+        """Schedule lf to be written as table name"""
+        self.outputs[name] = lf
+
+    def scratch_dir(self, name: str) -> Path:
+        """An empty temp directory for table name's intermediate files, removed after collect"""
+        scratch_dir = self.data_dir / f".{name}.shards"
+        _remove(scratch_dir)
+        self.scratch_dirs.append(scratch_dir)
+        return scratch_dir
+
+    def _partitioned(self, name: str) -> bool:
+        return self.partition_by_year and name in PARTITIONED_TABLES
+
+    def _output_path(self, name: str) -> Path:
+        """File, or per-year directory, that table name is written to"""
+        if self._partitioned(name):
+            return _partition_dir(self.data_dir, name, self.output_format)
+        return _table_path(self.data_dir, name, self.output_format)
+
+    def collect(self) -> tuple[dict[str, pl.DataFrame], dict[str, int]]:
+        """
+        Run every query and write, returning the query results and the row count of each output.
+        Every count, the deduplicated player tables' included, is a len() over the same cached
+        frame the sink writes, so it is exactly the number of rows written.
+        Inputs may still be scanning the files being rewritten, so writes go to temp files that
+        replace their targets afterwards. Empty outputs are dropped so an existing table is
+        never replaced by an empty one.
+        """
+        plans = list(self.queries.values())
+        tmp_paths = {}
+        for name, lf in self.outputs.items():
+            output_path = self._output_path(name)
+            tmp_paths[name] = tmp_path = output_path.with_name(output_path.name + ".tmp")
+            _remove(tmp_path)
+            target = tmp_path
+            if self._partitioned(name):
+                # Each season gets its own file, written on its own handle
+                target = pl.PartitionByKey(tmp_path, by="year")
+            # The sink and the row count read one cached copy of the output, so counting
+            # adds no scan or recomputation of the table
+            lf = lf.cache()
+            plans += [_sink(lf, target, self.output_format), lf.select(pl.len())]
+        
+        try:
+            # The streaming engine also runs the row counts and uniques in batches, so the
+            # extracted tables never sit in memory next to the player-table dedup
+            results = pl.collect_all(plans, engine="streaming")
+            query_results = dict(zip(self.queries, results))
+            counts = results[len(self.queries) + 1::2]
+            row_counts = {name: df.item() for name, df in zip(self.outputs, counts)}
+            for name, tmp_path in tmp_paths.items():
+                if row_counts[name] > 0:
+                    output_path = self._output_path(name)
+                    if output_path.is_dir():
+                        shutil.rmtree(output_path)
+                    os.replace(tmp_path, output_path)
+        finally:
+            for tmp_path in [*tmp_paths.values(), *self.scratch_dirs]:
+                _remove(tmp_path)
+        return query_results, row_counts
+
+
+def fix_historic_player_data(plan: _Plan) -> pl.LazyFrame | None:
+    """Fix HistoricPlayerData - extract contracts/injury/playtime and deduplicate"""
+    file_path = _source_path(plan.data_dir, "HistoricPlayerData", plan.output_format)
     if not file_path.exists():
         logger.warning(f"{file_path} not found, skipping")
         return None
     
-    logger.info("Processing HistoricPlayerData.csv...")
-    df = pl.read_csv(file_path, infer_schema_length=10000, null_values=["", "NA", "NaN"])
-    original_count = len(df)
+    logger.info(f"Planning {file_path.name}...")
+    pk = ["playerID", "year"]
+    # Column names from the header alone, read once here for the scan and every check
+    # below, so planning never waits on schema inference
+    header = _columns(file_path)
+    columns = set(header)
+    # One cached frame that every query below reads from, so the file is parsed once
+    lf, shard_lfs = _load(plan, file_path, "HistoricPlayerData", header, pk)
+    plan.queries["HistoricPlayerData"] = lf.select(pl.len())
     
     # Check if contract columns exist
-    has_contracts = "contractSalary" in df.columns
+    has_contracts = "contractSalary" in columns
+    contracts_lf = None
     
-    contracts_df = None
     if has_contracts:
         # Extract contract data before removing columns
-        contract_cols = ["playerID", "year", "contractSalary", "contractCreateDate", "contractExpireDate"]
-        available_cols = [c for c in contract_cols if c in df.columns]
-        
-        contracts_df = df.select(available_cols).filter(
-            pl.col("contractSalary").is_not_null()
-        )
-        logger.info(f"  Extracted {len(contracts_df)} contract records from HistoricPlayerData")
+        contracts_lf = _extract_contracts(lf, columns)
     
     # Remove columns that belong in separate 3NF tables
-    cols_to_drop = [c for c in ["contractSalary", "contractCreateDate", "contractExpireDate", "injuryStatus", "playTime"] if c in df.columns]
+    cols_to_drop = [c for c in EXTRACTED_COLUMNS if c in columns]
     if cols_to_drop:
-        df = df.drop(cols_to_drop)
-        logger.info(f"  Removed columns for 3NF: {cols_to_drop}")
+        logger.info(f"  Removing columns for 3NF: {cols_to_drop}")
     
     # Deduplicate by primary key (playerID, year) - keep first occurrence
-    df_dedup = df.unique(subset=["playerID", "year"], keep="first")
-    dedup_count = len(df_dedup)
-    
-    # Save fixed file
-    df_dedup.write_csv(file_path)
-    logger.info(f"  HistoricPlayerData: {original_count} -> {dedup_count} rows ({original_count - dedup_count} duplicates removed)")
+    kept_cols = [c for c in header if c not in cols_to_drop]
+    plan.write("HistoricPlayerData", _dedup(lf, shard_lfs, pk, kept_cols))
     
-    return contracts_df
+    return contracts_lf
 
 
-def fix_weekly_player_data(data_dir: Path):
-    """Fix WeeklyPlayerData.csv - extract contracts/injury/playtime and deduplicate"""
-    file_path = data_dir / "WeeklyPlayerData.csv"
+def fix_weekly_player_data(plan: _Plan) -> tuple[pl.LazyFrame | None, pl.LazyFrame | None, pl.LazyFrame | None]:
+    """Fix WeeklyPlayerData - extract contracts/injury/playtime and deduplicate"""
+    file_path = _source_path(plan.data_dir, "WeeklyPlayerData", plan.output_format)
     if not file_path.exists():
         logger.warning(f"{file_path} not found, skipping")
         return None, None, None
     
-    logger.info("Processing WeeklyPlayerData.csv...")
-    df = pl.read_csv(file_path, infer_schema_length=10000, null_values=["", "NA", "NaN"])
-    original_count = len(df)
-    
-    contracts_df = None
-    injury_df = None
-    snap_df = None
-    
-    # Extract contract data
-    if "contractSalary" in df.columns:
-        contract_cols = ["playerID", "year", "contractSalary", "contractCreateDate", "contractExpireDate"]
-        available_cols = [c for c in contract_cols if c in df.columns]
-        
-        contracts_df = df.select(available_cols).filter(
-            pl.col("contractSalary").is_not_null()
-        ).unique()
-        logger.info(f"  Extracted {len(contracts_df)} unique contract records")
+    logger.info(f"Planning {file_path.name}...")
+    pk = ["playerID", "week", "year"]
+    # Column names from the header alone, read once here for the scan and every check
+    # below, so planning never waits on schema inference
+    header = _columns(file_path)
+    columns = set(header)
+    # One cached frame that every query below reads from, so the file is parsed once
+    lf, shard_lfs = _load(plan, file_path, "WeeklyPlayerData", header, pk)
+    plan.queries["WeeklyPlayerData"] = lf.select(pl.len())
+    contracts_lf = injury_lf = snap_lf = None
+    
+    # Extract contract data (deduplicated together with the historic contracts)
+    if "contractSalary" in columns:
+        contracts_lf = _extract_contracts(lf, columns)
     
     # Extract injury data
-    if "injuryStatus" in df.columns:
+    if "injuryStatus" in columns:
         injury_cols = ["playerID", "week", "year", "injuryStatus"]
-        available_cols = [c for c in injury_cols if c in df.columns]
-        
-        injury_df = df.select(available_cols).filter(
-            pl.col("injuryStatus").is_not_null()
-        ).unique(subset=["playerID", "week", "year"], keep="first")
-        logger.info(f"  Extracted {len(injury_df)} injury records")
+        injury_lf = _extract(lf, columns, injury_cols, "injuryStatus", pk)
     
     # Extract snap count data (from playTime column if it exists)
-    # Note: playTime is formatted as "snaps/pct%" - we'll preserve as-is for now
-    if "playTime" in df.columns:
+    # Note: playTime is formatted as "snaps/pct%" - split once here into numeric columns
+    if "playTime" in columns:
         snap_cols = ["playerID", "week", "year", "playTime"]
-        available_cols = [c for c in snap_cols if c in df.columns]
-        
-        snap_df = df.select(available_cols).filter(
-            pl.col("playTime").is_not_null()
-        ).unique(subset=["playerID", "week", "year"], keep="first")
-        logger.info(f"  Extracted {len(snap_df)} snap count records")
+        snap_lf = _extract(lf, columns, snap_cols, "playTime", pk).with_columns(
+            pl.col("playTime").str.extract(r"^(\d+)", 1).cast(pl.Int16).alias("snaps"),
+            pl.col("playTime").str.extract(r"/([\d.]+)%", 1).cast(pl.Float32).alias("snap_pct"),
+        ).drop("playTime")
     
     # Remove columns that belong in separate 3NF tables
-    cols_to_drop = [c for c in ["contractSalary", "contractCreateDate", "contractExpireDate", "injuryStatus", "playTime"] if c in df.columns]
+    cols_to_drop = [c for c in EXTRACTED_COLUMNS if c in columns]
     if cols_to_drop:
-        df = df.drop(cols_to_drop)
-        logger.info(f"  Removed columns for 3NF: {cols_to_drop}")
+        logger.info(f"  Removing columns for 3NF: {cols_to_drop}")
     
     # Deduplicate by primary key (playerID, week, year) - keep first occurrence
-    df_dedup = df.unique(subset=["playerID", "week", "year"], keep="first")
-    dedup_count = len(df_dedup)
-    
-    # Save fixed file
-    df_dedup.write_csv(file_path)
-    logger.info(f"  WeeklyPlayerData: {original_count} -> {dedup_count} rows ({original_count - dedup_count} duplicates removed)")
+    kept_cols = [c for c in header if c not in cols_to_drop]
+    plan.write("WeeklyPlayerData", _dedup(lf, shard_lfs, pk, kept_cols))
     
-    return contracts_df, injury_df, snap_df
+    return contracts_lf, injury_lf, snap_lf
 
 
-def fix_trade_table(data_dir: Path):
-    """Fix TradeTable.csv - remove player_name (3NF: use PlayerMapping)"""
-    file_path = data_dir / "TradeTable.csv"
+def fix_trade_table(plan: _Plan):
+    """Fix TradeTable - remove player_name (3NF: use PlayerMapping)"""
+    file_path = _source_path(plan.data_dir, "TradeTable", plan.output_format)
     if not file_path.exists():
         logger.warning(f"{file_path} not found, skipping")
         return
     
-    logger.info("Processing TradeTable.csv...")
-    df = pl.read_csv(file_path, infer_schema_length=10000, null_values=["", "NA", "NaN"])
-    original_cols = df.columns
+    logger.info(f"Planning {file_path.name}...")
+    output_path = _table_path(plan.data_dir, "TradeTable", plan.output_format)
     
-    if "player_name" in df.columns:
-        df = df.drop("player_name")
-        df.write_csv(file_path)
-        logger.info(f"  TradeTable: removed player_name column (3NF - use PlayerMapping)")
+    # Decide from the header alone; the table is only scanned when it has to be rewritten,
+    # and then streams straight from the scan to the sink without player_name being parsed
+    header = _columns(file_path)
+    if "player_name" in header:
+        plan.write("TradeTable", _scan(file_path, "TradeTable", header).drop("player_name"))
+        logger.info(f"  TradeTable: removing player_name column (3NF - use PlayerMapping)")
     else:
+        if output_path != file_path:
+            plan.write("TradeTable", _scan(file_path, "TradeTable", header))
         logger.info(f"  TradeTable: already 3NF compliant")
 
 
-def create_player_contracts(data_dir: Path, historic_contracts: pl.DataFrame | None, weekly_contracts: pl.DataFrame | None):
-    """Combine and save all contract data to PlayerContracts.csv"""
-    contracts_list = []
-    
-    if historic_contracts is not None and len(historic_contracts) > 0:
-        contracts_list.append(historic_contracts)
-    
-    if weekly_contracts is not None and len(weekly_contracts) > 0:
-        contracts_list.append(weekly_contracts)
+def create_player_contracts(plan: _Plan, historic_contracts: pl.LazyFrame | None, weekly_contracts: pl.LazyFrame | None):
+    """Combine and save all contract data to PlayerContracts"""
+    contracts_list = [lf for lf in (historic_contracts, weekly_contracts) if lf is not None]
     
     if not contracts_list:
         logger.info("  No contract data found to extract (may already be in PlayerContracts.csv)")
         return
     
-    # Combine and deduplicate contracts
-    all_contracts = pl.concat(contracts_list, how="diagonal_relaxed")
-    all_contracts = all_contracts.unique()
+    # Deduplicate each source first (weekly rows repeat a contract every week), so the
+    # final unique only hashes the distinct contracts of each side
+    contracts_list = [lf.unique() for lf in contracts_list]
     
-    # Save to file
-    output_path = data_dir / "PlayerContracts.csv"
-    all_contracts.write_csv(output_path)
-    logger.info(f"  PlayerContracts: saved {len(all_contracts)} unique contract records")
+    # Combine and deduplicate contracts; _extract_contracts gives both sources the same
+    # schema, so they stack directly without resolving it while planning
+    plan.write("PlayerContracts", pl.concat(contracts_list, how="vertical").unique())
 
 
-def create_injury_data(data_dir: Path, injury_df: pl.DataFrame | None):
-    """Save injury data to InjuryData.csv"""
-    if injury_df is None or len(injury_df) == 0:
+def create_injury_data(plan: _Plan, injury_lf: pl.LazyFrame | None):
+    """Save injury data to InjuryData"""
+    if injury_lf is None:
         logger.info("  No injury data found to extract (may already be in InjuryData.csv)")
         return
     
-    output_path = data_dir / "InjuryData.csv"
-    injury_df.write_csv(output_path)
-    logger.info(f"  InjuryData: saved {len(injury_df)} records")
+    plan.write("InjuryData", injury_lf)
 
 
-def create_snap_counts(data_dir: Path, snap_df: pl.DataFrame | None):
-    """Save snap count data to SnapCounts.csv"""
-    if snap_df is None or len(snap_df) == 0:
+def create_snap_counts(plan: _Plan, snap_lf: pl.LazyFrame | None):
+    """Save snap count data to SnapCounts"""
+    if snap_lf is None:
         logger.info("  No snap count data found to extract (may already be in SnapCounts.csv)")
         return
     
-    # Rename playTime to a more appropriate column name if needed
-    if "playTime" in snap_df.columns:
-        snap_df = snap_df.rename({"playTime": "snapData"})
-    
-    output_path = data_dir / "SnapCounts.csv"
-    snap_df.write_csv(output_path)
-    logger.info(f"  SnapCounts: saved {len(snap_df)} records")
+    plan.write("SnapCounts", snap_lf)
+
 
+def _log_results(query_results: dict[str, pl.DataFrame], row_counts: dict[str, int]):
+    """Report the row counts of every table written by the plan"""
+    for name, row_count in row_counts.items():
+        if name in query_results:
+            # The player tables report how many duplicate rows were removed
+            original_count = query_results[name].item()
+            logger.info(f"  {name}: {original_count} -> {row_count} rows ({original_count - row_count} duplicates removed)")
+        elif row_count == 0:
+            logger.info(f"  {name}: no records found to extract, left unchanged")
+        else:
+            logger.info(f"  {name}: saved {row_count} records")
 
-def main():
+
+def main(output_format: str = "csv", partition_by_year: bool = False):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}")
+    
     print("=" * 60)
     print("NFL Data 3NF Normalizer")
     print("=" * 60)
@@ -213,19 +500,25 @@ def main():
     logger.info(f"Processing files in {data_dir.absolute()}/")
     logger.info("=" * 60)
     
+    plan = _Plan(data_dir, output_format, partition_by_year)
+    
     # Fix HistoricPlayerData
-    historic_contracts = fix_historic_player_data(data_dir)
+    historic_contracts = fix_historic_player_data(plan)
     
     # Fix WeeklyPlayerData
-    weekly_contracts, injury_df, snap_df = fix_weekly_player_data(data_dir)
+    weekly_contracts, injury_lf, snap_lf = fix_weekly_player_data(plan)
     
     # Fix TradeTable
-    fix_trade_table(data_dir)
+    fix_trade_table(plan)
     
     # Create 3NF normalized tables
-    create_player_contracts(data_dir, historic_contracts, weekly_contracts)
-    create_injury_data(data_dir, injury_df)
-    create_snap_counts(data_dir, snap_df)
+    create_player_contracts(plan, historic_contracts, weekly_contracts)
+    create_injury_data(plan, injury_lf)
+    create_snap_counts(plan, snap_lf)
+    
+    # Run the whole plan at once; each input's cached scan feeds every table built from it
+    logger.info("Writing tables...")
+    _log_results(*plan.collect())
     
     logger.info("=" * 60)
     logger.info("✓ 3NF normalization complete!")
@@ -209,6 +209,11 @@ CREATE TABLE TradeTable (
 -- 7. InjuryData.csv      -> InjuryData
 -- 8. SnapCounts.csv      -> SnapCounts
 -- 9. TradeTable.csv      -> TradeTable
+--
+-- When cleaned with CSVCleaner(compress_csv=True), each file also has a
+-- gzip copy that can be loaded without unpacking it first, e.g.:
+--   COPY Teams FROM PROGRAM 'gzip -dc /path/to/TeamMapping.csv.gz'
+--     WITH (FORMAT csv, HEADER true);
 -- ============================================================
 
 -- run this section after to redo all issues